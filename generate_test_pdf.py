@@ -1,49 +1,102 @@
 """Generate a test Thai mobile manual PDF with text and images."""
 import fitz  # PyMuPDF
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 
 # Thai font path (macOS system Thai font)
 THAI_FONT = "/System/Library/Fonts/Supplemental/Thonburi.ttc"
 
-def make_screenshot(width, height, color, label):
-    """Create a simple colored rectangle with text as a fake screenshot."""
-    doc = fitz.open()
-    page = doc.new_page(width=width, height=height)
-    page.draw_rect(fitz.Rect(0, 0, width, height), color=color, fill=color)
+# Scratch document shared by all make_screenshot() calls — each screenshot
+# borrows a temporary page instead of creating and tearing down its own document
+_scratch_doc = fitz.open()
+
+
+@lru_cache(maxsize=1)
+def load_thai_font():
+    """Parse the Thai font once per process."""
+    return fitz.Font(fontfile=THAI_FONT)
+
+
+class ThaiText:
+    """Collects a page's Thai text and writes it in one pass.
+
+    Uses one fitz.TextWriter per colour (TextWriter colour is per writer) and a
+    single pre-loaded Font, instead of re-loading the font file on every
+    insert_text() call.
+    """
+
+    def __init__(self, page, font):
+        self.page = page
+        self.font = font
+        self.writers = {}
+
+    def add(self, pos, text, fontsize, color):
+        writer = self.writers.get(color)
+        if writer is None:
+            writer = self.writers[color] = fitz.TextWriter(self.page.rect, color=color)
+        writer.append(pos, text, font=self.font, fontsize=fontsize)
+
+    def write(self):
+        for writer in self.writers.values():
+            writer.write_text(self.page)
+
+
+@lru_cache(maxsize=None)
+def screenshot_frame(width, height):
+    """Build the colour-independent screenshot chrome once per size.
+
+    Border, header bar and the OK/Cancel/Help buttons are drawn on a transparent
+    one-page PDF; make_screenshot() stamps it over each body fill.
+    """
+    frame = fitz.open()
+    page = frame.new_page(width=width, height=height)
     # Add a border
     page.draw_rect(fitz.Rect(2, 2, width-2, height-2), color=(0.3, 0.3, 0.3), width=2)
     # Add some UI-like elements
     page.draw_rect(fitz.Rect(10, 10, width-10, 50), color=(0.2, 0.2, 0.2), fill=(0.2, 0.2, 0.2))
-    page.insert_text((20, 38), label, fontsize=14, color=(1, 1, 1))
     # Add fake buttons
     for i, btn in enumerate(["OK", "Cancel", "Help"]):
         x = 30 + i * 90
         page.draw_rect(fitz.Rect(x, height-60, x+70, height-30),
                        color=(0.4, 0.4, 0.8), fill=(0.4, 0.4, 0.8))
         page.insert_text((x+15, height-40), btn, fontsize=11, color=(1, 1, 1))
+    return frame
 
-    pix = page.get_pixmap(dpi=150)
-    img_bytes = pix.tobytes("png")
-    doc.close()
-    return img_bytes
 
+@lru_cache(maxsize=None)
+def make_screenshot(width, height, color, label):
+    """Create a simple colored rectangle with text as a fake screenshot.
+
+    Only the body fill and label are drawn per call; the frame comes from the
+    cached screenshot_frame() template.
+    Returns the rendered Pixmap itself: it is only re-embedded into the test PDF,
+    so encoding it to PNG first would just run Deflate for MuPDF to undo.
+    Results are memoized per (width, height, color, label) — treat the returned
+    Pixmap as read-only.
+    """
+    page = _scratch_doc.new_page(width=width, height=height)
+    page.draw_rect(page.rect, color=color, fill=color)
+    page.show_pdf_page(page.rect, screenshot_frame(width, height), 0)
+    # The frame XObject already carries a "helv" resource; a distinct name makes
+    # insert_text() register Helvetica on this page too
+    page.insert_text((20, 38), label, fontname="Helvetica", fontsize=14, color=(1, 1, 1))
 
-def create_test_pdf(output_path="test.pdf"):
-    doc = fitz.open()
+    pix = page.get_pixmap(dpi=150)
+    _scratch_doc.delete_page(page.number)
+    return pix
 
-    # ─── Page 1: Cover / Title ───
-    page = doc.new_page()
+
+# ─── Page 1: Cover / Title ───
+def build_page_1(page, text):
     w, h = page.rect.width, page.rect.height
 
     # Title block
     page.draw_rect(fitz.Rect(50, 80, w-50, 250), color=(0.1, 0.3, 0.7), fill=(0.1, 0.3, 0.7))
-    page.insert_text((80, 150), "คู่มือการใช้งาน", fontname="thai", fontfile=THAI_FONT,
-                     fontsize=28, color=(1, 1, 1))
-    page.insert_text((80, 200), "สมาร์ทโฟน รุ่น XZ-500 Pro", fontname="thai", fontfile=THAI_FONT,
-                     fontsize=18, color=(0.9, 0.9, 1))
+    text.add((80, 150), "คู่มือการใช้งาน", 28, (1, 1, 1))
+    text.add((80, 200), "สมาร์ทโฟน รุ่น XZ-500 Pro", 18, (0.9, 0.9, 1))
 
-    page.insert_text((80, 300), "สารบัญ", fontname="thai", fontfile=THAI_FONT,
-                     fontsize=20, color=(0, 0, 0))
+    text.add((80, 300), "สารบัญ", 20, (0, 0, 0))
 
     toc_items = [
         "1. การเริ่มต้นใช้งาน ..................... หน้า 2",
@@ -53,17 +106,15 @@ def create_test_pdf(output_path="test.pdf"):
     ]
     y = 340
     for item in toc_items:
-        page.insert_text((100, y), item, fontname="thai", fontfile=THAI_FONT,
-                         fontsize=13, color=(0.2, 0.2, 0.2))
+        text.add((100, y), item, 13, (0.2, 0.2, 0.2))
         y += 30
 
-    page.insert_text((80, 550), "เวอร์ชัน 2.0 | ภาษาไทย", fontname="thai", fontfile=THAI_FONT,
-                     fontsize=11, color=(0.5, 0.5, 0.5))
+    text.add((80, 550), "เวอร์ชัน 2.0 | ภาษาไทย", 11, (0.5, 0.5, 0.5))
 
-    # ─── Page 2: Getting Started (text-heavy) ───
-    page = doc.new_page()
-    page.insert_text((50, 60), "1. การเริ่มต้นใช้งาน", fontname="thai", fontfile=THAI_FONT,
-                     fontsize=22, color=(0.1, 0.3, 0.7))
+
+# ─── Page 2: Getting Started (text-heavy) ───
+def build_page_2(page, text):
+    text.add((50, 60), "1. การเริ่มต้นใช้งาน", 22, (0.1, 0.3, 0.7))
 
     paragraphs = [
         "ขอบคุณที่เลือกใช้สมาร์ทโฟน XZ-500 Pro คู่มือนี้จะช่วยให้คุณเริ่มต้นใช้งานอุปกรณ์ได้อย่างรวดเร็ว",
@@ -95,34 +146,32 @@ def create_test_pdf(output_path="test.pdf"):
             continue
         size = 14 if line.startswith("1.") and not line.startswith("  ") else 12
         color = (0.1, 0.1, 0.1) if not line.startswith("1.") or line.startswith("  ") else (0.2, 0.2, 0.5)
-        page.insert_text((70, y), line, fontname="thai", fontfile=THAI_FONT,
-                         fontsize=size, color=color)
+        text.add((70, y), line, size, color)
         y += 22
 
     # Small image on this page
     img1 = make_screenshot(200, 150, (0.95, 0.95, 0.95), "Power Button")
-    page.insert_image(fitz.Rect(350, 350, 550, 500), stream=img1)
+    page.insert_image(fitz.Rect(350, 350, 550, 500), pixmap=img1)
 
-    # ─── Page 3: Wi-Fi Settings (image-heavy — should trigger Strategy A) ───
-    page = doc.new_page()
-    page.insert_text((50, 60), "2. การตั้งค่า Wi-Fi", fontname="thai", fontfile=THAI_FONT,
-                     fontsize=22, color=(0.1, 0.3, 0.7))
+
+# ─── Page 3: Wi-Fi Settings (image-heavy — should trigger Strategy A) ───
+def build_page_3(page, text):
+    text.add((50, 60), "2. การตั้งค่า Wi-Fi", 22, (0.1, 0.3, 0.7))
 
     # Large screenshot covering most of the page
     wifi_img = make_screenshot(400, 600, (0.92, 0.95, 1.0), "Wi-Fi Settings")
-    page.insert_image(fitz.Rect(50, 90, 450, 690), stream=wifi_img)
+    page.insert_image(fitz.Rect(50, 90, 450, 690), pixmap=wifi_img)
 
     # Second image
     wifi_img2 = make_screenshot(200, 300, (0.9, 1.0, 0.9), "Connected")
-    page.insert_image(fitz.Rect(350, 400, 550, 700), stream=wifi_img2)
+    page.insert_image(fitz.Rect(350, 400, 550, 700), pixmap=wifi_img2)
 
-    page.insert_text((50, 730), "แตะที่ชื่อเครือข่ายที่ต้องการเชื่อมต่อ แล้วใส่รหัสผ่าน",
-                     fontname="thai", fontfile=THAI_FONT, fontsize=11, color=(0.3, 0.3, 0.3))
+    text.add((50, 730), "แตะที่ชื่อเครือข่ายที่ต้องการเชื่อมต่อ แล้วใส่รหัสผ่าน", 11, (0.3, 0.3, 0.3))
 
-    # ─── Page 4: Camera (mixed text + images) ───
-    page = doc.new_page()
-    page.insert_text((50, 60), "3. การใช้งานกล้อง", fontname="thai", fontfile=THAI_FONT,
-                     fontsize=22, color=(0.1, 0.3, 0.7))
+
+# ─── Page 4: Camera (mixed text + images) ───
+def build_page_4(page, text):
+    text.add((50, 60), "3. การใช้งานกล้อง", 22, (0.1, 0.3, 0.7))
 
     camera_text = [
         "กล้อง XZ-500 Pro มีความละเอียด 108 ล้านพิกเซล รองรับการถ่ายวิดีโอ 4K",
@@ -146,29 +195,26 @@ def create_test_pdf(output_path="test.pdf"):
             continue
         size = 14 if line.startswith("3.") and not line.startswith("  ") else 12
         color = (0.1, 0.1, 0.1) if not line.startswith("3.") or line.startswith("  ") else (0.2, 0.2, 0.5)
-        page.insert_text((70, y), line, fontname="thai", fontfile=THAI_FONT,
-                         fontsize=size, color=color)
+        text.add((70, y), line, size, color)
         y += 22
 
     # Camera UI screenshots
     cam_img1 = make_screenshot(220, 180, (0.1, 0.1, 0.1), "Camera App")
-    page.insert_image(fitz.Rect(50, 400, 270, 580), stream=cam_img1)
+    page.insert_image(fitz.Rect(50, 400, 270, 580), pixmap=cam_img1)
 
     cam_img2 = make_screenshot(220, 180, (0.15, 0.15, 0.2), "Pro Mode")
-    page.insert_image(fitz.Rect(300, 400, 520, 580), stream=cam_img2)
+    page.insert_image(fitz.Rect(300, 400, 520, 580), pixmap=cam_img2)
 
-    page.insert_text((50, 610), "ภาพที่ 1: หน้าจอแอปกล้อง", fontname="thai", fontfile=THAI_FONT,
-                     fontsize=10, color=(0.5, 0.5, 0.5))
-    page.insert_text((300, 610), "ภาพที่ 2: โหมดโปร", fontname="thai", fontfile=THAI_FONT,
-                     fontsize=10, color=(0.5, 0.5, 0.5))
+    text.add((50, 610), "ภาพที่ 1: หน้าจอแอปกล้อง", 10, (0.5, 0.5, 0.5))
+    text.add((300, 610), "ภาพที่ 2: โหมดโปร", 10, (0.5, 0.5, 0.5))
 
-    # ─── Page 5: Troubleshooting (table-like content) ───
-    page = doc.new_page()
-    page.insert_text((50, 60), "4. การแก้ไขปัญหา", fontname="thai", fontfile=THAI_FONT,
-                     fontsize=22, color=(0.1, 0.3, 0.7))
 
-    page.insert_text((50, 100), "ตารางปัญหาที่พบบ่อยและวิธีแก้ไข", fontname="thai", fontfile=THAI_FONT,
-                     fontsize=14, color=(0.2, 0.2, 0.2))
+# ─── Page 5: Troubleshooting (table-like content) ───
+def build_page_5(page, text):
+    w = page.rect.width
+    text.add((50, 60), "4. การแก้ไขปัญหา", 22, (0.1, 0.3, 0.7))
+
+    text.add((50, 100), "ตารางปัญหาที่พบบ่อยและวิธีแก้ไข", 14, (0.2, 0.2, 0.2))
 
     # Draw a table
     col1, col2, col3 = 50, 230, 410
@@ -178,12 +224,9 @@ def create_test_pdf(output_path="test.pdf"):
     # Header
     page.draw_rect(fitz.Rect(col1, row_y, w-50, row_y+row_h),
                    fill=(0.2, 0.3, 0.6), color=(0.2, 0.3, 0.6))
-    page.insert_text((col1+10, row_y+25), "ปัญหา", fontname="thai", fontfile=THAI_FONT,
-                     fontsize=12, color=(1, 1, 1))
-    page.insert_text((col2+10, row_y+25), "สาเหตุ", fontname="thai", fontfile=THAI_FONT,
-                     fontsize=12, color=(1, 1, 1))
-    page.insert_text((col3+10, row_y+25), "วิธีแก้ไข", fontname="thai", fontfile=THAI_FONT,
-                     fontsize=12, color=(1, 1, 1))
+    text.add((col1+10, row_y+25), "ปัญหา", 12, (1, 1, 1))
+    text.add((col2+10, row_y+25), "สาเหตุ", 12, (1, 1, 1))
+    text.add((col3+10, row_y+25), "วิธีแก้ไข", 12, (1, 1, 1))
 
     rows = [
         ("เปิดเครื่องไม่ได้", "แบตเตอรี่หมด", "ชาร์จอย่างน้อย 30 นาที"),
@@ -198,12 +241,9 @@ def create_test_pdf(output_path="test.pdf"):
         ry = row_y + row_h * (i + 1)
         bg = (0.95, 0.95, 0.95) if i % 2 == 0 else (1, 1, 1)
         page.draw_rect(fitz.Rect(col1, ry, w-50, ry+row_h), fill=bg, color=(0.8, 0.8, 0.8))
-        page.insert_text((col1+10, ry+25), prob, fontname="thai", fontfile=THAI_FONT,
-                         fontsize=10, color=(0.1, 0.1, 0.1))
-        page.insert_text((col2+10, ry+25), cause, fontname="thai", fontfile=THAI_FONT,
-                         fontsize=10, color=(0.1, 0.1, 0.1))
-        page.insert_text((col3+10, ry+25), fix, fontname="thai", fontfile=THAI_FONT,
-                         fontsize=10, color=(0.1, 0.1, 0.1))
+        text.add((col1+10, ry+25), prob, 10, (0.1, 0.1, 0.1))
+        text.add((col2+10, ry+25), cause, 10, (0.1, 0.1, 0.1))
+        text.add((col3+10, ry+25), fix, 10, (0.1, 0.1, 0.1))
 
     # Draw table borders
     table_bottom = row_y + row_h * 7
@@ -211,15 +251,57 @@ def create_test_pdf(output_path="test.pdf"):
     page.draw_line(fitz.Point(col2, row_y), fitz.Point(col2, table_bottom), color=(0.5, 0.5, 0.5))
     page.draw_line(fitz.Point(col3, row_y), fitz.Point(col3, table_bottom), color=(0.5, 0.5, 0.5))
 
-    page.insert_text((50, table_bottom + 40),
-                     "หากปัญหายังไม่หายไป กรุณาติดต่อศูนย์บริการ XZ ที่หมายเลข 1234",
-                     fontname="thai", fontfile=THAI_FONT, fontsize=12, color=(0.3, 0.3, 0.3))
-    page.insert_text((50, table_bottom + 65),
-                     "เว็บไซต์: www.xz-mobile.co.th | อีเมล: support@xz-mobile.co.th",
-                     fontname="thai", fontfile=THAI_FONT, fontsize=11, color=(0.3, 0.3, 0.3))
+    text.add((50, table_bottom + 40), "หากปัญหายังไม่หายไป กรุณาติดต่อศูนย์บริการ XZ ที่หมายเลข 1234", 12, (0.3, 0.3, 0.3))
+    text.add((50, table_bottom + 65), "เว็บไซต์: www.xz-mobile.co.th | อีเมล: support@xz-mobile.co.th", 11, (0.3, 0.3, 0.3))
+
+
+PAGE_BUILDERS = [build_page_1, build_page_2, build_page_3, build_page_4, build_page_5]
 
-    # Save
-    doc.save(output_path)
+
+def add_page(doc, page_no):
+    """Append page `page_no` (1-based) to `doc`."""
+    page = doc.new_page()
+    text = ThaiText(page, load_thai_font())
+    PAGE_BUILDERS[page_no - 1](page, text)
+    text.write()
+
+
+def build_page(page_no):
+    """Build one page in its own single-page document and return it as PDF bytes.
+
+    Runs in a worker process: MuPDF serialises work inside one process, so
+    separate processes are the only way to build pages in parallel.
+    """
+    doc = fitz.open()
+    add_page(doc, page_no)
+    # Compress in the worker so the parallel part includes the Deflate work
+    return doc.tobytes(deflate=True, deflate_images=True)
+
+
+def create_test_pdf(output_path="test.pdf", workers=1):
+    """Build the test PDF.
+
+    With workers > 1, pages are built in a process pool and merged in order.
+    For the 5-page default document, process start-up costs more than it
+    saves, so pages are built in-process unless asked otherwise.
+    """
+    page_numbers = range(1, len(PAGE_BUILDERS) + 1)
+    doc = fitz.open()
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for pdf_bytes in pool.map(build_page, page_numbers):
+                with fitz.open("pdf", pdf_bytes) as page_doc:
+                    doc.insert_pdf(page_doc)
+    else:
+        for page_no in page_numbers:
+            add_page(doc, page_no)
+
+    # Save — embed only the Thai glyphs actually used instead of the whole font;
+    # garbage collection drops the full font programs the subsets replace.
+    # Screenshots are embedded as raw pixmaps, so compress every stream here.
+    doc.subset_fonts()
+    doc.save(output_path, garbage=3, deflate=True, deflate_images=True,
+             deflate_fonts=True, use_objstms=1)
     doc.close()
     print(f"Created {output_path} — 5 pages, Thai mobile manual with text, images, and tables")
 
@@ -0,0 +1,96 @@
+"""
+cache.py — Content-Addressed Vision Response Cache
+===================================================
+Stores vision LLM responses on disk keyed by (image bytes, model, prompt),
+so re-processing the same PDF (e.g. while tuning prompts) skips every call
+whose inputs have not changed.
+
+Layout: <output_dir>/.vision_cache/<key[:2]>/<key>.txt
+"""
+
+import hashlib
+import os
+import re
+import tempfile
+from pathlib import Path
+
+from .providers.base import BaseVisionProvider
+
+CACHE_DIRNAME = ".vision_cache"
+
+# Providers report failures in-band as "[<Name> error: ...]" — never cache those
+_PROVIDER_ERROR = re.compile(r"^\[\w+ error: ")
+
+
+def cache_key(image_bytes: bytes, model: str, prompt: str) -> str:
+    """Return the hex blake2b digest identifying one vision request."""
+    h = hashlib.blake2b()
+    h.update(image_bytes)
+    h.update(b"\0" + model.encode("utf-8"))
+    h.update(b"\0" + prompt.encode("utf-8"))
+    return h.hexdigest()
+
+
+def cache_path(cache_dir: Path, image_bytes: bytes, model: str, prompt: str) -> Path:
+    """Return the cache file path for one (image, model, prompt) request."""
+    key = cache_key(image_bytes, model, prompt)
+    return cache_dir / key[:2] / f"{key}.txt"
+
+
+def is_provider_error(text: str) -> bool:
+    """True if `text` is a provider's in-band failure message rather than a description."""
+    return bool(_PROVIDER_ERROR.match(text))
+
+
+def read_cached(path: Path) -> str | None:
+    """Return the cached description at `path`, or None on a miss."""
+    if path.exists():
+        return path.read_text(encoding="utf-8")
+    return None
+
+
+def write_cached(path: Path, description: str) -> None:
+    """Atomically store a description at `path`, skipping provider error strings."""
+    if is_provider_error(description):
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write(description)
+    os.replace(tmp, path)
+
+
+async def cached_ask_vision(
+    provider:    BaseVisionProvider,
+    image_bytes: bytes,
+    prompt:      str,
+    cache_dir:   Path = None,
+    media_type:  str = "image/png",
+) -> str:
+    """
+    Ask the vision provider about an image, reusing a cached response if one exists.
+
+    Responses are written atomically (temp file + os.replace) so concurrent
+    pages never see a partial entry.
+
+    Args:
+        provider:    Vision LLM provider instance
+        image_bytes: Raw encoded image bytes (PNG/JPEG)
+        prompt:      Instruction prompt
+        cache_dir:   Cache root directory, None = caching disabled
+        media_type:  MIME type of image_bytes
+
+    Returns:
+        Text description from the cache or the vision model
+    """
+    if cache_dir is None:
+        return await provider.ask(image_bytes, prompt, media_type)
+
+    path   = cache_path(cache_dir, image_bytes, provider.model, prompt)
+    cached = read_cached(path)
+    if cached is not None:
+        return cached
+
+    description = await provider.ask(image_bytes, prompt, media_type)
+    write_cached(path, description)
+    return description
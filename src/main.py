@@ -5,11 +5,12 @@ Run: python src/main.py --help
 """
 
 import argparse
+import asyncio
 import sys
 from pathlib import Path
 
-from .providers import get_provider
-from .processor import process_pdf
+from .providers import BaseVisionProvider, get_provider
+from .processor import MAX_CONCURRENCY, RENDER_WORKERS, process_pdf
 
 # Default model per provider
 PROVIDER_DEFAULTS = {
@@ -19,6 +20,35 @@ PROVIDER_DEFAULTS = {
 }
 
 
+async def process_all(
+    pdfs:       list[Path],
+    output_dir: Path,
+    provider:   BaseVisionProvider,
+    args:       argparse.Namespace,
+) -> list[tuple[Path, Path]]:
+    """
+    Process PDFs one after another inside a single event loop,
+    so provider clients and their connections live for the whole run.
+    """
+    results = []
+    for pdf_path in pdfs:
+        md_path, meta_path = await process_pdf(
+            pdf_path           = pdf_path,
+            output_dir         = output_dir,
+            provider           = provider,
+            start_page         = args.start_page,
+            end_page           = args.end_page,
+            lang               = args.lang,
+            concurrency        = args.concurrency,
+            archive_png        = args.archive_png,
+            use_cache          = not args.no_cache,
+            render_workers     = args.render_workers,
+            skip_desc_text_len = args.skip_image_desc_if_text_len,
+        )
+        results.append((md_path, meta_path))
+    return results
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="PDF Vision Processor — Thai-first RAG pre-processing tool",
@@ -61,6 +91,20 @@ Examples:
                         help="Start page number, 0-indexed (default: 0)")
     parser.add_argument("--end-page",   type=int, default=None,
                         help="End page number exclusive (default: all pages)")
+    parser.add_argument("--concurrency", type=int, default=MAX_CONCURRENCY,
+                        help=f"Max pages processed at once (default: {MAX_CONCURRENCY})")
+    parser.add_argument("--max-in-flight", type=int, default=None, metavar="N",
+                        help="Max vision requests awaiting a reply at once "
+                             "(default: 4 for ollama, 16 for cloud providers)")
+    parser.add_argument("--render-workers", type=int, default=RENDER_WORKERS,
+                        help=f"Processes rendering full pages, 0 = in-process (default: {RENDER_WORKERS})")
+    parser.add_argument("--skip-image-desc-if-text-len", type=int, default=0, metavar="N",
+                        help="Save but don't describe images under 200x200 px on pages "
+                             "with at least N characters of text (default: 0 = describe all)")
+    parser.add_argument("--archive-png", action="store_true",
+                        help="Save full-page renders as lossless PNG (default: reuse the JPEG sent to the LLM)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Ignore cached vision responses in <output>/.vision_cache")
     parser.add_argument("--skip-check", action="store_true",
                         help="Skip provider availability check")
 
@@ -72,7 +116,7 @@ Examples:
     output_dir.mkdir(parents=True, exist_ok=True)
 
     # Initialize and verify provider
-    provider = get_provider(args.provider, model)
+    provider = get_provider(args.provider, model, args.max_in_flight)
     if not args.skip_check:
         print(f"\nChecking provider: {args.provider} / {model}")
         provider.check()
@@ -81,7 +125,8 @@ Examples:
     if input_path.is_file():
         pdfs = [input_path]
     elif input_path.is_dir():
-        pdfs = sorted(input_path.glob("*.pdf"))
+        # Largest first (longest-processing-time order), ties by name
+        pdfs = sorted(input_path.glob("*.pdf"), key=lambda p: (-p.stat().st_size, p.name))
         print(f"Found {len(pdfs)} PDF(s) in {input_path}")
     else:
         print(f"Input not found: {input_path}")
@@ -92,17 +137,7 @@ Examples:
         sys.exit(1)
 
     # Process all PDFs
-    results = []
-    for pdf_path in pdfs:
-        md_path, meta_path = process_pdf(
-            pdf_path   = pdf_path,
-            output_dir = output_dir,
-            provider   = provider,
-            start_page = args.start_page,
-            end_page   = args.end_page,
-            lang       = args.lang,
-        )
-        results.append((md_path, meta_path))
+    results = asyncio.run(process_all(pdfs, output_dir, provider, args))
 
     print(f"\n{'='*60}")
     print(f"Done! {len(results)} file(s) processed.")
@@ -5,13 +5,34 @@ Handles page-by-page PDF processing, image extraction,
 vision LLM description, and Markdown + metadata output.
 """
 
-import base64
+import asyncio
+import hashlib
+import io
 import json
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import islice
 from pathlib import Path
 
 import fitz  # PyMuPDF
 from tqdm import tqdm
 
+try:
+    import pypdfium2 as pdfium  # Optional: faster page rendering than MuPDF
+except ImportError:
+    pdfium = None
+
+try:
+    import orjson  # Optional: faster metadata JSON encoding than the stdlib
+except ImportError:
+    orjson = None
+
+from .cache import (
+    CACHE_DIRNAME, cache_path, cached_ask_vision,
+    is_provider_error, read_cached, write_cached,
+)
 from .providers.base import BaseVisionProvider
 from .prompts import get_prompts
 
@@ -19,63 +40,338 @@ from .prompts import get_prompts
 # CONFIG
 # ─────────────────────────────────────────────
 IMAGE_DPI               = 150   # Render DPI for full-page captures
+JPEG_QUALITY            = 85    # JPEG quality for full-page renders sent to the vision LLM
 MIN_IMAGE_SIZE          = 100   # Skip images smaller than this (px) — icons/decorations
 PAGE_AS_IMAGE_THRESHOLD = 0.5   # Pages where images cover >50% → render full page
+SMALL_IMAGE_AREA        = 200 * 200  # Images below this (px²) may skip description on text-heavy pages
+UNDESCRIBED_IMAGE       = "[embedded image — not described]"
+VISION_IMAGE_FORMATS    = {"png", "jpeg", "gif", "webp"}  # Formats every vision API accepts as-is
+MAX_CONCURRENCY         = 8     # Pages in flight at once (vision calls are network-bound)
+IO_WORKERS              = 4     # Background threads writing images to disk
+MAX_PENDING_WRITES      = 64    # Queued image writes before extraction waits on the disk
+IMAGE_BATCH_SIZE        = 4     # Max images per multi-image vision request (Strategy B)
+OUTPUT_BUFFER_SIZE      = 1 << 20  # Write buffer for the Markdown/metadata output files
+RENDER_WORKERS          = min(4, (os.cpu_count() or 1) - 1)  # Full-page render processes; one core stays with the event loop
+RENDER_TASKS_PER_WORKER = 10    # Pages a render process handles before it releases MuPDF's caches
+
+# Page → pixel transform for IMAGE_DPI renders, built once
+_MATRIX = fitz.Matrix(IMAGE_DPI / 72, IMAGE_DPI / 72)
+
+# Shared pool so image writes overlap with rendering and vision LLM waits
+io_pool = ThreadPoolExecutor(max_workers=IO_WORKERS, thread_name_prefix="image-writer")
 
 
 # ─────────────────────────────────────────────
 # IMAGE HELPERS
 # ─────────────────────────────────────────────
-def render_page_as_image(page: fitz.Page, dpi: int = IMAGE_DPI) -> tuple[str, bytes]:
+def render_page_pixmap(page: fitz.Page, dpi: int = IMAGE_DPI) -> fitz.Pixmap:
+    """Rasterize a page with MuPDF to an opaque RGB pixmap."""
+    mat = _MATRIX if dpi == IMAGE_DPI else fitz.Matrix(dpi / 72, dpi / 72)
+    return page.get_pixmap(matrix=mat, alpha=False, colorspace=fitz.csRGB)
+
+
+def render_page_for_vision(
+    page:       fitz.Page,
+    dpi:        int = IMAGE_DPI,
+    pdfium_doc: "pdfium.PdfDocument" = None,
+    pixmap:     fitz.Pixmap = None,
+) -> bytes:
+    """
+    Render an entire PDF page as a JPEG image for the vision LLM.
+    JPEG skips PNG's Deflate pass and gives a much smaller upload;
+    vision models are robust to the lossy encoding.
+
+    Args:
+        page:       PyMuPDF page to render
+        dpi:        Render resolution
+        pdfium_doc: Same PDF opened with pypdfium2; when given, rendering
+                    goes through pdfium, which is faster than MuPDF
+        pixmap:     Existing render_page_pixmap() result to encode instead
+                    of rasterizing the page again
+
+    Returns:
+        Raw JPEG bytes (providers that need base64 encode it themselves)
+    """
+    if pixmap is None and pdfium_doc is not None:
+        pdfium_page = pdfium_doc[page.number]
+        try:
+            bitmap = pdfium_page.render(scale=dpi / 72)
+            buf    = io.BytesIO()
+            bitmap.to_pil().save(buf, "JPEG", quality=JPEG_QUALITY)
+            bitmap = None  # Free the raw raster before copying out the JPEG
+            return buf.getvalue()
+        finally:
+            pdfium_page.close()
+
+    if pixmap is None:
+        pixmap = render_page_pixmap(page, dpi)
+    return pixmap.tobytes("jpeg", jpg_quality=JPEG_QUALITY)
+
+
+def render_page_for_archive(
+    page:   fitz.Page,
+    dpi:    int = IMAGE_DPI,
+    pixmap: fitz.Pixmap = None,
+) -> bytes:
     """
-    Render an entire PDF page as a PNG image.
+    Render an entire PDF page as a lossless PNG image for saving to disk.
+    Pass the pixmap already rendered for the vision JPEG to skip a second
+    rasterization.
 
     Returns:
-        Tuple of (base64_string, raw_png_bytes)
+        Raw PNG bytes
+    """
+    if pixmap is None:
+        pixmap = render_page_pixmap(page, dpi)
+    return pixmap.tobytes("png")
+
+
+def image_for_vision(doc: fitz.Document, xref: int, extracted: dict) -> tuple[bytes, str]:
+    """
+    Return an extracted image as (bytes, media type) the vision APIs accept.
+    PNG/JPEG/GIF/WebP are sent unchanged; other embedded formats (JPEG 2000,
+    JBIG2, TIFF, ...) are re-encoded as PNG, since a mismatched or unknown
+    media type is rejected outright.
+    """
+    if extracted["ext"] in VISION_IMAGE_FORMATS:
+        return extracted["image"], f"image/{extracted['ext']}"
+    pixmap = fitz.Pixmap(doc, xref)
+    if pixmap.colorspace is not None and pixmap.colorspace.n > 3:
+        pixmap = fitz.Pixmap(fitz.csRGB, pixmap)  # PNG has no CMYK
+    return pixmap.tobytes("png"), "image/png"
+
+
+# Per-process document handles for render_page_worker(), keyed by path
+_worker_docs: dict[str, tuple] = {}
+_worker_tasks = 0
+
+
+def render_page_worker(pdf_path: str, page_num: int, archive: bool = False) -> bytes:
+    """
+    Process-pool entry point: render one page as the vision JPEG, or as the
+    lossless archive PNG when `archive` is set.
+    PyMuPDF documents cannot be pickled and MuPDF holds the GIL while
+    rendering, so each worker process opens its own copy of the PDF
+    (once, on first use) and renders pages from it in parallel.
+
+    Every RENDER_TASKS_PER_WORKER pages the worker closes its documents and
+    empties MuPDF's object store, so the C-side caches of a long document
+    are released instead of growing for the whole run. (Recycling workers
+    with max_tasks_per_child would do the same, but it deadlocks the pool
+    on Python 3.11.)
     """
-    mat       = fitz.Matrix(dpi / 72, dpi / 72)
-    pixmap    = page.get_pixmap(matrix=mat, alpha=False)
-    img_bytes = pixmap.tobytes("png")
-    img_b64   = base64.b64encode(img_bytes).decode("utf-8")
-    return img_b64, img_bytes
+    global _worker_tasks
+    _worker_tasks += 1
+    if _worker_tasks > RENDER_TASKS_PER_WORKER:
+        for doc, pdfium_doc in _worker_docs.values():
+            doc.close()
+            if pdfium_doc is not None:
+                pdfium_doc.close()
+        _worker_docs.clear()
+        fitz.TOOLS.store_shrink(100)
+        _worker_tasks = 1
+
+    docs = _worker_docs.get(pdf_path)
+    if docs is None:
+        docs = _worker_docs[pdf_path] = (
+            fitz.open(pdf_path),
+            pdfium.PdfDocument(pdf_path) if pdfium is not None else None,
+        )
+    doc, pdfium_doc = docs
+    if archive:
+        return render_page_for_archive(doc[page_num])
+    return render_page_for_vision(doc[page_num], pdfium_doc=pdfium_doc)
 
 
 def get_image_coverage(page: fitz.Page) -> float:
     """
     Calculate what fraction of the page area is covered by images.
 
+    All image placements come from one page.get_image_info() call. The
+    per-xref page.get_image_rects() lookup decodes every image to hash it,
+    which is far more work than the coverage check needs.
+
+    Inline images count too. page.get_images() does not list them, so
+    Strategy B could never extract them; a page they cover is better
+    rendered whole. (Telling them apart would need get_image_info(xrefs=True),
+    which hashes every image.)
+
+    Args:
+        page: PyMuPDF page
+
     Returns:
         Float between 0.0 and 1.0
     """
     page_area = page.rect.width * page.rect.height
     if page_area == 0:
         return 0.0
-    image_area = sum(
-        rect.width * rect.height
-        for img in page.get_images(full=True)
-        for rect in page.get_image_rects(img[0])
-    )
+    # A plain loop on purpose: building a NumPy array from the bbox tuples
+    # costs more than the arithmetic it would vectorize, even at 500 images
+    image_area = 0.0
+    for info in page.get_image_info():
+        x0, y0, x1, y1 = info["bbox"]
+        image_area += (x1 - x0) * (y1 - y0)
     return min(image_area / page_area, 1.0)
 
 
+def dump_record(record: dict) -> bytes:
+    """
+    Serialize one metadata record as UTF-8 JSON indented by two spaces —
+    the same bytes json.dumps(..., ensure_ascii=False, indent=2) produces.
+    """
+    if orjson is not None:
+        return orjson.dumps(record, option=orjson.OPT_INDENT_2)
+    return json.dumps(record, ensure_ascii=False, indent=2).encode("utf-8")
+
+
 def save_image(img_bytes: bytes, path: Path) -> None:
     """Save raw image bytes to disk, creating parent directories as needed."""
     path.parent.mkdir(parents=True, exist_ok=True)
     path.write_bytes(img_bytes)
 
 
+def reap_writes(pending: list[asyncio.Future]) -> None:
+    """Drop finished writes from `pending`, reporting any that failed."""
+    running = []
+    for future in pending:
+        if not future.done():
+            running.append(future)
+        elif future.exception() is not None:
+            print(f"  Error saving image: {future.exception()}")
+    pending[:] = running
+
+
+async def submit_save_image(img_bytes: bytes, path: Path, pending: list[asyncio.Future]) -> None:
+    """
+    Queue save_image() on io_pool and record its future in `pending`.
+    Once MAX_PENDING_WRITES are queued the caller waits until one finishes,
+    so a slow output disk holds back extraction instead of buffering every
+    image in memory. The wait is awaited, never blocking: other pages and
+    their vision calls keep running meanwhile.
+    """
+    reap_writes(pending)
+    while len(pending) >= MAX_PENDING_WRITES:
+        await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        reap_writes(pending)
+    pending.append(asyncio.get_running_loop().run_in_executor(io_pool, save_image, img_bytes, path))
+
+
+# ─────────────────────────────────────────────
+# VISION HELPERS
+# ─────────────────────────────────────────────
+def parse_description_array(reply: str, count: int) -> list[str] | None:
+    """
+    Parse a multi-image reply (a JSON array of strings, possibly wrapped in
+    a ```json fence) into exactly `count` descriptions.
+
+    Returns:
+        List of descriptions, or None if the reply is malformed
+    """
+    start, end = reply.find("["), reply.rfind("]")
+    if start == -1 or end <= start:
+        return None
+    try:
+        items = json.loads(reply[start:end + 1])
+    except ValueError:
+        return None
+    if not isinstance(items, list) or len(items) != count:
+        return None
+    if not all(isinstance(item, str) for item in items):
+        return None
+    return [item.strip() for item in items]
+
+
+async def describe_images(
+    provider:    BaseVisionProvider,
+    images:      list[bytes],
+    media_types: list[str],
+    prompts:     dict,
+    cache_dir:   Path = None,
+) -> list[str]:
+    """
+    Describe several images from one page, in order.
+
+    Cached images are skipped and every remaining request is issued
+    concurrently. Providers that accept several images per request get them
+    in batches of IMAGE_BATCH_SIZE, so the prompt and request overhead are
+    paid once per batch; a batch that fails or whose reply cannot be parsed
+    falls back to one request per image, so one bad image cannot cost its
+    neighbours their descriptions. Everything else goes through
+    provider.batch_ask().
+
+    Args:
+        provider:    Vision LLM provider instance
+        images:      Raw image bytes, in page order
+        media_types: MIME type of each image ("image/png", "image/jpeg", ...)
+        prompts:     Prompt set from get_prompts()
+        cache_dir:   Vision response cache directory, None = no caching
+
+    Returns:
+        One description per input image
+    """
+    prompt       = prompts["single_image"]
+    paths        = [None] * len(images)
+    descriptions = [None] * len(images)
+    if cache_dir is not None:
+        for i, img in enumerate(images):
+            paths[i]        = cache_path(cache_dir, img, provider.model, prompt)
+            descriptions[i] = read_cached(paths[i])
+
+    def fill(indices: list[int], replies: list[str]) -> None:
+        for i, description in zip(indices, replies):
+            descriptions[i] = description
+            if paths[i] is not None:
+                write_cached(paths[i], description)
+
+    singles = [i for i, d in enumerate(descriptions) if d is None]
+    if provider.supports_multi_image and len(singles) > 1:
+        batches = [
+            singles[start:start + IMAGE_BATCH_SIZE]
+            for start in range(0, len(singles), IMAGE_BATCH_SIZE)
+        ]
+        singles = [i for batch in batches if len(batch) == 1 for i in batch]
+        batches = [batch for batch in batches if len(batch) > 1]
+        replies = await asyncio.gather(*(
+            provider.ask_images(
+                [images[i] for i in batch],
+                prompt + prompts["multi_image"].format(count=len(batch)),
+                [media_types[i] for i in batch],
+            )
+            for batch in batches
+        ))
+        for batch, reply in zip(batches, replies):
+            parsed = None if is_provider_error(reply) else parse_description_array(reply, len(batch))
+            if parsed is None:
+                singles.extend(batch)
+            else:
+                fill(batch, parsed)
+
+    if singles:
+        fill(singles, await provider.batch_ask(
+            [(images[i], prompt, media_types[i]) for i in singles]
+        ))
+
+    return descriptions
+
+
 # ─────────────────────────────────────────────
 # PAGE PROCESSOR
 # ─────────────────────────────────────────────
-def process_page(
-    doc:              fitz.Document,
-    page_num:         int,
-    provider:         BaseVisionProvider,
-    images_dir:       Path,
-    doc_stem:         str,
-    metadata_catalog: list,
-    lang:             str = "th",
-) -> str:
+async def process_page(
+    doc:                fitz.Document,
+    page_num:           int,
+    provider:           BaseVisionProvider,
+    images_dir:         Path,
+    doc_stem:           str,
+    prompts:            dict,
+    archive_png:        bool = False,
+    cache_dir:          Path = None,
+    writes:             list[asyncio.Future] = None,
+    pdfium_doc:         "pdfium.PdfDocument" = None,
+    image_cache:        dict[int | bytes, asyncio.Future] = None,
+    render_pool:        ProcessPoolExecutor = None,
+    skip_desc_text_len: int = 0,
+) -> tuple[str, list]:
     """
     Process a single PDF page and return enriched Markdown string.
 
@@ -83,32 +379,83 @@ def process_page(
     actual screenshots in chat responses.
 
     Args:
-        doc:              Open PyMuPDF document
-        page_num:         Zero-indexed page number
-        provider:         Vision LLM provider instance
-        images_dir:       Directory to save extracted images
-        doc_stem:         PDF filename without extension (used for naming)
-        metadata_catalog: List to append image metadata records to
-        lang:             Language code for prompts ("th" or "en")
+        doc:                Open PyMuPDF document
+        page_num:           Zero-indexed page number
+        provider:           Vision LLM provider instance
+        images_dir:         Directory to save extracted images
+        doc_stem:           PDF filename without extension (used for naming)
+        prompts:            Prompt set from get_prompts(), shared by every page
+        archive_png:        Save full-page renders as lossless PNG instead of
+                            reusing the JPEG sent to the vision LLM
+        cache_dir:          Vision response cache directory, None = no caching
+        writes:             List collecting background image-write futures,
+                            None = write synchronously
+        pdfium_doc:         Same PDF opened with pypdfium2 for faster full-page
+                            renders, None = render with PyMuPDF
+        image_cache:        Shared across pages of one document: image xref and
+                            blake2b content digest → future of (image_file,
+                            description). Repeated images (logos, icons) are saved
+                            and described once. None = no dedup
+        render_pool:        Process pool for Strategy A renders, None = render in
+                            this process
+        skip_desc_text_len: On pages with at least this many characters of
+                            text, images under SMALL_IMAGE_AREA are saved but not
+                            sent to the vision LLM. 0 = describe every image
 
     Returns:
-        Markdown string for this page
+        Tuple of (markdown_string, image_metadata_records) for this page
     """
-    page       = doc[page_num]
-    coverage   = get_image_coverage(page)
-    page_label = f"Page {page_num + 1}"
-    prompts    = get_prompts(lang)
-    lines      = [f"\n\n---\n## {page_label}\n"]
+    page             = doc[page_num]
+    images           = page.get_images(full=True)
+    coverage         = get_image_coverage(page)
+    page_label       = f"Page {page_num + 1}"
+    lines            = [f"\n\n---\n## {page_label}\n"]
+    metadata_catalog = []
+
+    async def store(img_bytes: bytes, path: Path) -> None:
+        if writes is None:
+            save_image(img_bytes, path)
+        else:
+            await submit_save_image(img_bytes, path, writes)
 
     # ── Strategy A: Image-heavy page → render entire page ───────────────────
     if coverage >= PAGE_AS_IMAGE_THRESHOLD:
         print(f"  [Page {page_num+1}] image-heavy ({coverage:.0%}) — full page render")
 
-        img_b64, img_bytes = render_page_as_image(page)
-        img_filename       = f"{doc_stem}_page_{page_num+1:03d}_full.png"
-        save_image(img_bytes, images_dir / img_filename)
-
-        description = provider.ask(img_b64, prompts["full_page"])
+        # The JPEG goes to the vision LLM; the optional PNG archive copy is
+        # kept off that path — encoded in parallel when a render pool exists,
+        # otherwise only after the vision call has been answered.
+        archive_job = None
+        pixmap      = None
+        if render_pool is not None:
+            loop       = asyncio.get_running_loop()
+            vision_job = loop.run_in_executor(render_pool, render_page_worker, doc.name, page_num)
+            if archive_png:
+                archive_job = loop.run_in_executor(
+                    render_pool, render_page_worker, doc.name, page_num, True
+                )
+            img_bytes = await vision_job
+        else:
+            if archive_png and pdfium_doc is None:
+                # One MuPDF raster serves both the JPEG and the archive PNG
+                pixmap = render_page_pixmap(page)
+            img_bytes = render_page_for_vision(page, pdfium_doc=pdfium_doc, pixmap=pixmap)
+
+        if archive_png:
+            img_filename = f"{doc_stem}_page_{page_num+1:03d}_full.png"
+        else:
+            img_filename = f"{doc_stem}_page_{page_num+1:03d}_full.jpg"
+            await store(img_bytes, images_dir / img_filename)
+
+        description = await cached_ask_vision(
+            provider, img_bytes, prompts["full_page"], cache_dir, "image/jpeg"
+        )
+        if archive_png:
+            if archive_job is not None:
+                png_bytes = await archive_job
+            else:
+                png_bytes = render_page_for_archive(page, pixmap=pixmap)
+            await store(png_bytes, images_dir / img_filename)
 
         metadata_catalog.append({
             "image_file":  img_filename,
@@ -129,74 +476,178 @@ def process_page(
         if text:
             lines.append(text)
 
-        images = page.get_images(full=True)
         if images:
             print(f"  [Page {page_num+1}] {len(images)} image(s) — saving & describing")
 
+        # The text already carries this page; small images next to it are
+        # usually icons or banners the vision model adds little to
+        skip_small = 0 < skip_desc_text_len <= len(text)
+
+        # Pass 1: extract and save. Entries are (metadata record, shared future)
+        # pairs — the future is set for images already seen on another page —
+        # or error lines kept in place so the Markdown order matches the page.
+        entries         = []
+        kept_bytes      = []
+        kept_types      = []
+        owned           = []
         img_saved_count = 0
         for img_idx, img_info in enumerate(images):
-            xref = img_info[0]
-            try:
-                base_image = doc.extract_image(xref)
-                img_bytes  = base_image["image"]
-                img_w      = base_image.get("width", 0)
-                img_h      = base_image.get("height", 0)
-
-                if img_w < MIN_IMAGE_SIZE or img_h < MIN_IMAGE_SIZE:
-                    continue  # Skip tiny decorative images
+            xref, _, img_w, img_h = img_info[:4]
+            if img_w < MIN_IMAGE_SIZE or img_h < MIN_IMAGE_SIZE:
+                continue  # Skip tiny decorative images — size comes from the XObject, no decode needed
 
+            shared      = image_cache.get(xref) if image_cache is not None else None
+            undescribed = False
+            try:
+                if shared is None:
+                    extracted = doc.extract_image(xref)
+                    img_bytes = extracted["image"]
+                    if image_cache is not None:
+                        # The same picture is often embedded again under a new xref
+                        digest = hashlib.blake2b(img_bytes, digest_size=16).digest()
+                        shared = image_cache.get(digest)
                 img_saved_count += 1
-                img_filename = f"{doc_stem}_page_{page_num+1:03d}_img{img_saved_count}.png"
-                save_image(img_bytes, images_dir / img_filename)
-
-                img_b64     = base64.b64encode(img_bytes).decode("utf-8")
-                description = provider.ask(img_b64, prompts["single_image"])
-
-                metadata_catalog.append({
+                if shared is None:
+                    img_filename = f"{doc_stem}_page_{page_num+1:03d}_img{img_saved_count}.png"
+                    undescribed  = skip_small and img_w * img_h < SMALL_IMAGE_AREA
+                    if not undescribed:
+                        vision_bytes, media_type = image_for_vision(doc, xref, extracted)
+                        kept_bytes.append(vision_bytes)
+                        kept_types.append(media_type)
+                        if image_cache is not None:
+                            future = asyncio.get_running_loop().create_future()
+                            image_cache[xref] = image_cache[digest] = future
+                            owned.append(future)
+                    # Saved only once the image is claimed in image_cache: the
+                    # store may wait on the disk, and another page must not
+                    # extract and describe the same image meanwhile
+                    try:
+                        await store(img_bytes, images_dir / img_filename)
+                    except Exception as e:
+                        # Undo the claim so pass 2 stays in step with `entries`
+                        if not undescribed:
+                            kept_bytes.pop()
+                            kept_types.pop()
+                            if image_cache is not None:
+                                owned.pop()
+                                del image_cache[xref], image_cache[digest]
+                                future.set_exception(RuntimeError(f"image on page {page_num+1} failed: {e}"))
+                                future.exception()  # Mark retrieved, as in pass 2
+                        raise
+                    img_bytes = extracted = None  # Held by kept_bytes / the write queue only while needed
+                else:
+                    image_cache[xref] = shared
+                    img_filename      = None  # Filled in from the page that first saved it
+
+                entries.append(({
                     "image_file":  img_filename,
                     "page":        page_num + 1,
                     "index":       img_saved_count,
                     "type":        "extracted_image",
                     "width":       img_w,
                     "height":      img_h,
-                    "description": description,
+                    "description": UNDESCRIBED_IMAGE if undescribed else None,
                     "source_doc":  doc_stem,
                     "provider":    provider.__class__.__name__,
                     "model":       provider.model,
-                })
-
-                lines.append(
-                    f"\n[IMAGE:{img_filename}]\n"
-                    f"**[ภาพที่ {img_saved_count}]:** {description}\n"
-                )
+                }, shared))
 
             except Exception as e:
-                lines.append(f"\n**[ภาพที่ {img_idx+1}]:** [Error: {e}]\n")
+                entries.append(f"\n**[ภาพที่ {img_idx+1}]:** [Error: {e}]\n")
+
+        # Pass 2: describe every newly kept image (batched where the provider
+        # allows), then publish the results for later pages before waiting on
+        # any shared image — so two pages can never wait on each other.
+        # A failure only costs the affected images an [Error] line, as before;
+        # the page text and every other image are still written.
+        describe_error = None
+        try:
+            descriptions = iter(await describe_images(provider, kept_bytes, kept_types, prompts, cache_dir))
+            new_records  = [
+                e[0] for e in entries
+                if not isinstance(e, str) and e[1] is None and e[0]["description"] is None
+            ]
+            kept_bytes.clear()  # Described — do not hold the images while waiting on other pages
+            for record in new_records:
+                record["description"] = next(descriptions)
+            for future, record in zip(owned, new_records):
+                future.set_result((record["image_file"], record["description"]))
+        except BaseException as e:
+            for future in owned:
+                if not future.done():
+                    future.set_exception(RuntimeError(f"image on page {page_num+1} failed: {e}"))
+                    future.exception()  # Mark retrieved — pages reusing the image report it themselves
+            if not isinstance(e, Exception):
+                raise
+            describe_error = e
+
+        for entry in entries:
+            if isinstance(entry, str):
+                lines.append(entry)
+                continue
+
+            record, shared = entry
+            label = f"ภาพที่ {record['index']}"
+            if shared is not None:
+                try:
+                    record["image_file"], record["description"] = await shared
+                except Exception as e:
+                    lines.append(f"\n**[{label}]:** [Error: {e}]\n")
+                    continue
+                label += " (reused)"
+            elif record["description"] is None:
+                lines.append(f"\n**[{label}]:** [Error: {describe_error}]\n")
+                continue
+            metadata_catalog.append(record)
+            lines.append(
+                f"\n[IMAGE:{record['image_file']}]\n"
+                f"**[{label}]:** {record['description']}\n"
+            )
 
-    return "\n".join(lines)
+    return "\n".join(lines), metadata_catalog
 
 
 # ─────────────────────────────────────────────
 # PDF PROCESSOR
 # ─────────────────────────────────────────────
-def process_pdf(
-    pdf_path:   Path,
-    output_dir: Path,
-    provider:   BaseVisionProvider,
-    start_page: int = 0,
-    end_page:   int = None,
-    lang:       str = "th",
+async def process_pdf(
+    pdf_path:           Path,
+    output_dir:         Path,
+    provider:           BaseVisionProvider,
+    start_page:         int = 0,
+    end_page:           int = None,
+    lang:               str = "th",
+    concurrency:        int = MAX_CONCURRENCY,
+    archive_png:        bool = False,
+    use_cache:          bool = True,
+    render_workers:     int = RENDER_WORKERS,
+    skip_desc_text_len: int = 0,
 ) -> tuple[Path, Path]:
     """
     Process an entire PDF file.
 
+    Pages are processed concurrently (up to `concurrency` at a time) so the
+    vision LLM round-trips overlap; output order always follows page order.
+    Markdown and metadata are streamed to disk page by page, so memory stays
+    flat on long documents and a crashed run leaves partial output behind.
+
+    Full-page renders (Strategy A) run in a pool of `render_workers`
+    processes, so MuPDF rendering uses several cores while the event loop
+    keeps extracting images and waiting on the vision LLM.
+
     Args:
-        pdf_path:   Path to the input PDF
-        output_dir: Directory to write output files
-        provider:   Vision LLM provider instance
-        start_page: First page to process (0-indexed)
-        end_page:   Last page to process (exclusive), None = all pages
-        lang:       Language code for prompts
+        pdf_path:           Path to the input PDF
+        output_dir:         Directory to write output files
+        provider:           Vision LLM provider instance
+        start_page:         First page to process (0-indexed)
+        end_page:           Last page to process (exclusive), None = all pages
+        lang:               Language code for prompts
+        concurrency:        Maximum number of pages in flight at once
+        archive_png:        Save full-page renders as PNG (default: the JPEG sent to the LLM)
+        use_cache:          Reuse vision responses cached under output_dir/.vision_cache
+        render_workers:     Processes for full-page renders, 0 = render in this process
+        skip_desc_text_len: Leave small images undescribed on pages with at
+                            least this much text, 0 = describe every image
 
     Returns:
         Tuple of (markdown_path, metadata_json_path)
@@ -207,45 +658,98 @@ def process_pdf(
     print(f"{'='*60}")
 
     doc         = fitz.open(str(pdf_path))
+    # Render workers open their own copy; the parent only renders without a pool
+    pdfium_doc  = (
+        pdfium.PdfDocument(str(pdf_path))
+        if pdfium is not None and render_workers <= 0 else None
+    )
     total_pages = len(doc)
     end_page    = end_page or total_pages
     doc_stem    = pdf_path.stem
 
     images_dir = output_dir / "images" / doc_stem
     images_dir.mkdir(parents=True, exist_ok=True)
+    cache_dir = output_dir / CACHE_DIRNAME if use_cache else None
+    prompts   = get_prompts(lang)
 
     print(f"  Pages    : {start_page+1} – {end_page} (of {total_pages})")
     print(f"  Images   : {images_dir}")
 
-    all_content = [
+    header = [
         f"# {doc_stem}\n",
         f"> Provider: `{provider.__class__.__name__}` | Model: `{provider.model}` | Pages: {total_pages}\n",
         f"> Images: `images/{doc_stem}/`\n",
     ]
-    metadata_catalog = []
-
-    for page_num in tqdm(range(start_page, end_page), desc="Pages", unit="pg"):
-        try:
-            content = process_page(
-                doc, page_num, provider,
-                images_dir, doc_stem, metadata_catalog, lang
-            )
-            all_content.append(content)
-        except Exception as e:
-            print(f"  Error on page {page_num+1}: {e}")
-            all_content.append(f"\n\n---\n## Page {page_num+1}\n[Error: {e}]\n")
+    image_count = 0
+    writes      = []
+    image_cache = {}
 
-    doc.close()
-
-    # Save outputs
     md_path   = output_dir / f"{doc_stem}_enriched.md"
     meta_path = output_dir / f"{doc_stem}_images_metadata.json"
 
-    md_path.write_text("\n".join(all_content), encoding="utf-8")
-    meta_path.write_text(
-        json.dumps(metadata_catalog, ensure_ascii=False, indent=2), encoding="utf-8"
-    )
+    # Spawned, not forked: by now this process runs writer, executor and
+    # tqdm threads, and forking a threaded process can deadlock the child
+    render_pool = ProcessPoolExecutor(
+        max_workers=render_workers,
+        mp_context=multiprocessing.get_context("spawn"),
+    ) if render_workers > 0 else None
+    semaphore   = asyncio.Semaphore(max(1, concurrency))
+    progress    = tqdm(total=max(0, end_page - start_page), desc="Pages", unit="pg")
+
+    async def bounded(page_num: int) -> tuple[str, list]:
+        async with semaphore:
+            try:
+                return await process_page(
+                    doc, page_num, provider,
+                    images_dir, doc_stem, prompts, archive_png, cache_dir, writes,
+                    pdfium_doc, image_cache, render_pool, skip_desc_text_len,
+                )
+            except Exception as e:
+                print(f"  Error on page {page_num+1}: {e}")
+                return f"\n\n---\n## Page {page_num+1}\n[Error: {e}]\n", []
+            finally:
+                progress.update(1)
+
+    # Pages are scheduled in a sliding window of 2 × concurrency: enough slack
+    # that one slow page does not stall the rest, while bounding how many
+    # finished-but-not-yet-written pages are held in memory.
+    pages = iter(range(start_page, end_page))
+    tasks = deque(asyncio.ensure_future(bounded(p)) for p in islice(pages, 2 * max(1, concurrency)))
+
+    # Awaiting tasks in page order writes each page as soon as it and every
+    # page before it are done. The metadata file is written as the same
+    # indented JSON array as before. The buffers only coalesce the writes
+    # of one page; both files are flushed after every page, so a crash
+    # (even a MuPDF segfault) leaves every finished page on disk.
+    with md_path.open("w", encoding="utf-8", buffering=OUTPUT_BUFFER_SIZE) as md_file, \
+         meta_path.open("wb", buffering=OUTPUT_BUFFER_SIZE) as meta_file:
+        md_file.write("\n".join(header))
+        meta_file.write(b"[")
+        while tasks:
+            content, records = await tasks.popleft()
+            tasks.extend(asyncio.ensure_future(bounded(p)) for p in islice(pages, 1))
+            md_file.write("\n")
+            md_file.write(content)  # Written as-is; concatenating would copy the page text
+            for record in records:
+                meta_file.write(b",\n" if image_count else b"\n")
+                meta_file.write(b"  " + dump_record(record).replace(b"\n", b"\n  "))
+                image_count += 1
+            md_file.flush()
+            meta_file.flush()
+        meta_file.write(b"\n]" if image_count else b"]")
+
+    progress.close()
+    doc.close()
+    if pdfium_doc is not None:
+        pdfium_doc.close()
+    if render_pool is not None:
+        render_pool.shutdown()
+
+    # Make sure every image is on disk before reporting the document as done
+    if writes:
+        await asyncio.wait(writes)
+    reap_writes(writes)
 
     print(f"\n  Markdown : {md_path}  ({md_path.stat().st_size / 1024:.1f} KB)")
-    print(f"  Metadata : {meta_path}  ({len(metadata_catalog)} images)")
+    print(f"  Metadata : {meta_path}  ({image_count} images)")
     return md_path, meta_path
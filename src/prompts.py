@@ -30,6 +30,13 @@ TH_SINGLE_IMAGE = (
     "หากมีข้อความในภาพให้คัดลอกออกมาด้วย ตอบเป็นภาษาไทยในรูปแบบย่อหน้าสั้นๆ"
 )
 
+# Appended to the single-image prompt when several images share one request
+TH_MULTI_IMAGE = (
+    "\n\nคำขอนี้มีภาพทั้งหมด {count} ภาพ เรียงตามลำดับ\n"
+    "ให้ตอบเป็น JSON array ของข้อความจำนวน {count} รายการเท่านั้น "
+    "(หนึ่งรายการต่อหนึ่งภาพ ตามลำดับเดียวกับภาพ) ห้ามมีข้อความอื่นนอก JSON"
+)
+
 # ─────────────────────────────────────────────
 # ENGLISH PROMPTS
 # ─────────────────────────────────────────────
@@ -49,6 +56,12 @@ EN_SINGLE_IMAGE = (
     "Be specific and technical. Output as a short paragraph."
 )
 
+EN_MULTI_IMAGE = (
+    "\n\nThis request contains {count} images, in order. "
+    "Respond ONLY with a JSON array of {count} strings — one description "
+    "per image, in the same order as the images. No text outside the JSON."
+)
+
 # ─────────────────────────────────────────────
 # PROMPT REGISTRY
 # ─────────────────────────────────────────────
@@ -56,10 +69,12 @@ PROMPTS = {
     "th": {
         "full_page":    TH_FULL_PAGE,
         "single_image": TH_SINGLE_IMAGE,
+        "multi_image":  TH_MULTI_IMAGE,
     },
     "en": {
         "full_page":    EN_FULL_PAGE,
         "single_image": EN_SINGLE_IMAGE,
+        "multi_image":  EN_MULTI_IMAGE,
     },
 }
 
@@ -73,6 +88,7 @@ def get_prompts(lang: str = "th") -> dict:
         lang: Language code — "th" (Thai) or "en" (English)
 
     Returns:
-        dict with keys: full_page, single_image
+        dict with keys: full_page, single_image, multi_image
+        (multi_image is a suffix with a {count} placeholder)
     """
     return PROMPTS.get(lang, PROMPTS["th"])
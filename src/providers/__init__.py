@@ -9,28 +9,30 @@ import sys
 from .base import BaseVisionProvider
 
 
-def get_provider(provider_name: str, model: str) -> BaseVisionProvider:
+def get_provider(provider_name: str, model: str, max_in_flight: int = None) -> BaseVisionProvider:
     """
     Factory function — returns the correct provider instance.
 
     Args:
         provider_name: "ollama" | "openai" | "claude"
         model:         Model name string
+        max_in_flight: Max vision requests awaiting a reply at once,
+                       None = the provider's default
 
     Returns:
         Instantiated BaseVisionProvider subclass
     """
     if provider_name == "ollama":
         from .ollama_provider import OllamaProvider
-        return OllamaProvider(model)
+        return OllamaProvider(model, max_in_flight)
 
     elif provider_name == "openai":
         from .openai_provider import OpenAIProvider
-        return OpenAIProvider(model)
+        return OpenAIProvider(model, max_in_flight)
 
     elif provider_name == "claude":
         from .claude_provider import ClaudeProvider
-        return ClaudeProvider(model)
+        return ClaudeProvider(model, max_in_flight)
 
     else:
         print(f"Unknown provider '{provider_name}'. Use: ollama | openai | claude")
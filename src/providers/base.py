@@ -11,30 +11,186 @@ To add a new provider (e.g. Google Gemini):
   5. Add default model to PROVIDER_DEFAULTS in src/main.py
 """
 
+import asyncio
+import base64
+import random
 from abc import ABC, abstractmethod
+from functools import cached_property
+from importlib.util import find_spec
+
+try:
+    import httpx  # Installed by every provider SDK; only the cloud clients use it here
+except ImportError:
+    httpx = None
+
+try:
+    import pybase64  # Optional: SIMD base64 encoder, much faster than the stdlib
+except ImportError:
+    pybase64 = None
+
+MAX_IN_FLIGHT        = 16   # Vision requests awaiting a reply at once, per provider
+HTTP_MAX_CONNECTIONS = 64   # Open connections per cloud client
+HTTP_MAX_KEEPALIVE   = 32   # Of those, kept alive between requests
+
+RETRY_BASE_DELAY = 1.0      # Seconds before the first retry; doubles per attempt
+RETRY_MAX_DELAY  = 60.0     # Upper bound for any single wait, Retry-After included
+
+# HTTP statuses where the same request can never succeed (bad input, auth, unknown model)
+NON_RETRYABLE_STATUS = {400, 401, 403, 404, 413, 422}
+
+
+def encode_image(image: bytes) -> str:
+    """
+    Base64-encode raw image bytes for providers whose API takes base64 text.
+    Uses pybase64 when installed; otherwise the stdlib result is decoded as
+    ASCII, which skips UTF-8 validation of a string that can be megabytes
+    long for full-page renders.
+    """
+    if pybase64 is not None:
+        return pybase64.b64encode_as_string(image)
+    return base64.b64encode(image).decode("ascii")
+
+
+def retry_delay(error: Exception, attempt: int) -> float | None:
+    """
+    How long to wait before retrying a failed vision request.
+    Honors a Retry-After header when the server sends one, otherwise backs
+    off exponentially with jitter so concurrent pages don't retry in lockstep.
+
+    Args:
+        error:   Exception raised by the provider SDK
+        attempt: Zero-indexed attempt that just failed
+
+    Returns:
+        Seconds to wait, or None if retrying cannot help
+    """
+    if getattr(error, "status_code", None) in NON_RETRYABLE_STATUS:
+        return None
+    response    = getattr(error, "response", None)
+    retry_after = response.headers.get("retry-after") if response is not None else None
+    if retry_after:
+        try:
+            return min(max(float(retry_after), 0.0), RETRY_MAX_DELAY)
+        except ValueError:
+            pass  # HTTP-date form — fall back to backoff
+    return min(RETRY_BASE_DELAY * 2 ** attempt + random.random(), RETRY_MAX_DELAY)
+
+
+def http_client_options() -> dict:
+    """
+    httpx client settings shared by the cloud providers (OpenAI, Claude).
+    Keeps up to HTTP_MAX_KEEPALIVE connections alive between pages and
+    enables HTTP/2 when the optional h2 package is installed, so concurrent
+    requests multiplex over one TLS connection instead of each paying a handshake.
+
+    Returns:
+        kwargs for the SDK's DefaultAsyncHttpxClient
+    """
+    return {
+        "http2":  find_spec("h2") is not None,
+        "limits": httpx.Limits(
+            max_connections=HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=HTTP_MAX_KEEPALIVE,
+        ),
+    }
 
 
 class BaseVisionProvider(ABC):
     """Abstract base class for all vision LLM providers."""
 
-    def __init__(self, model: str):
+    # True if ask_images() can send several images in a single request
+    supports_multi_image: bool = False
+
+    # Default cap on requests awaiting a reply; pages × images per page can
+    # otherwise put hundreds in flight at once
+    max_in_flight: int = MAX_IN_FLIGHT
+
+    def __init__(self, model: str, max_in_flight: int = None):
         self.model = model
+        if max_in_flight:
+            self.max_in_flight = max_in_flight
+
+    @cached_property
+    def _in_flight(self) -> asyncio.Semaphore:
+        """Held by providers around each request they send, bounding max_in_flight."""
+        return asyncio.Semaphore(max(1, self.max_in_flight))
 
     @abstractmethod
-    def ask(self, image_b64: str, prompt: str, retries: int = 3) -> str:
+    async def ask(
+        self,
+        image:      bytes,
+        prompt:     str,
+        media_type: str = "image/png",
+        retries:    int = 3,
+    ) -> str:
         """
         Send an image to the vision model and return the text description.
+        Coroutine — callers await it so several pages can be in flight at once.
+        Providers encode the image however their API needs (see encode_image())
+        and hold self._in_flight around each request they send.
 
         Args:
-            image_b64: Base64-encoded PNG image string
-            prompt:    Instruction prompt (Thai or English)
-            retries:   Number of retry attempts on failure
+            image:      Raw encoded image bytes (PNG/JPEG)
+            prompt:     Instruction prompt (Thai or English)
+            media_type: MIME type of the encoded image ("image/png", "image/jpeg")
+            retries:    Number of retry attempts on failure
 
         Returns:
             Text description/transcription from the vision model
         """
         ...
 
+    async def ask_images(
+        self,
+        images:      list[bytes],
+        prompt:      str,
+        media_types: list[str] = None,
+        retries:     int = 3,
+    ) -> str:
+        """
+        Send several images in one request and return the model's raw reply.
+        Providers with supports_multi_image override this; the default only
+        handles a single image, which it passes to ask().
+
+        Args:
+            images:      Raw encoded image bytes, in order
+            prompt:      Instruction prompt covering all images
+            media_types: MIME type of each image, None = all "image/png"
+            retries:     Number of retry attempts on failure
+
+        Returns:
+            Raw text reply from the vision model
+        """
+        if len(images) != 1:
+            raise ValueError(
+                f"{self.__class__.__name__} sends one image per request, got {len(images)}"
+            )
+        media_type = media_types[0] if media_types else "image/png"
+        return await self.ask(images[0], prompt, media_type, retries)
+
+    async def batch_ask(
+        self,
+        requests: list[tuple[bytes, str, str]],
+        retries:  int = 3,
+    ) -> list[str]:
+        """
+        Describe several independent images, in order.
+        The default issues every ask() at once so the server can schedule them
+        together, up to max_in_flight; providers with a native batch API can
+        override this.
+
+        Args:
+            requests: (image, prompt, media_type) triples
+            retries:  Number of retry attempts per request
+
+        Returns:
+            One text description per request
+        """
+        return list(await asyncio.gather(*(
+            self.ask(image, prompt, media_type, retries)
+            for image, prompt, media_type in requests
+        )))
+
     @abstractmethod
     def check(self) -> None:
         """
@@ -6,50 +6,83 @@ Requires: pip install anthropic
 Requires: ANTHROPIC_API_KEY environment variable
 """
 
+import asyncio
 import os
 import sys
-import time
-from .base import BaseVisionProvider
+from functools import cached_property
+
+try:
+    import anthropic
+except ImportError:
+    anthropic = None  # Reported by check()
+
+from .base import BaseVisionProvider, encode_image, http_client_options, retry_delay
 
 
 class ClaudeProvider(BaseVisionProvider):
     """Vision provider using Anthropic Claude."""
 
-    def ask(self, image_b64: str, prompt: str, retries: int = 3) -> str:
-        import anthropic
-        client = anthropic.Anthropic(api_key=os.environ.get("ANTHROPIC_API_KEY"))
+    supports_multi_image = True
+
+    @cached_property
+    def _client(self):
+        """One AsyncAnthropic client per provider, so its connection pool is reused across pages."""
+        return anthropic.AsyncAnthropic(
+            api_key=os.environ.get("ANTHROPIC_API_KEY"),
+            max_retries=0,  # ask_images() retries with retry_delay(); SDK retries would stack on top
+            http_client=anthropic.DefaultAsyncHttpxClient(**http_client_options()),
+        )
+
+    async def ask(
+        self,
+        image:      bytes,
+        prompt:     str,
+        media_type: str = "image/png",
+        retries:    int = 3,
+    ) -> str:
+        return await self.ask_images([image], prompt, [media_type], retries)
+
+    async def ask_images(
+        self,
+        images:      list[bytes],
+        prompt:      str,
+        media_types: list[str] = None,
+        retries:     int = 3,
+    ) -> str:
+        media_types = media_types or ["image/png"] * len(images)
+        # Built once per request and reused unchanged across retries
+        messages = [{
+            "role": "user",
+            "content": [
+                {
+                    "type": "image",
+                    "source": {
+                        "type": "base64",
+                        "media_type": media_type,
+                        "data": image_b64,
+                    },
+                }
+                for image_b64, media_type in zip(map(encode_image, images), media_types)
+            ] + [{"type": "text", "text": prompt}],
+        }]
         for attempt in range(retries):
             try:
-                response = client.messages.create(
-                    model=self.model,
-                    max_tokens=2048,
-                    messages=[{
-                        "role": "user",
-                        "content": [
-                            {
-                                "type": "image",
-                                "source": {
-                                    "type": "base64",
-                                    "media_type": "image/png",
-                                    "data": image_b64,
-                                },
-                            },
-                            {"type": "text", "text": prompt},
-                        ],
-                    }],
-                )
+                async with self._in_flight:
+                    response = await self._client.messages.create(
+                        model=self.model,
+                        max_tokens=2048 * len(images),
+                        messages=messages,
+                    )
                 return response.content[0].text.strip()
             except Exception as e:
-                if attempt < retries - 1:
-                    print(f"  Warning: Claude error (attempt {attempt+1}/{retries}): {e}")
-                    time.sleep(3)
-                else:
+                delay = retry_delay(e, attempt)
+                if delay is None or attempt == retries - 1:
                     return f"[Claude error: {e}]"
+                print(f"  Warning: Claude error (attempt {attempt+1}/{retries}): {e}")
+                await asyncio.sleep(delay)
 
     def check(self) -> None:
-        try:
-            import anthropic
-        except ImportError:
+        if anthropic is None:
             print("Missing package: pip install anthropic")
             sys.exit(1)
         if not os.environ.get("ANTHROPIC_API_KEY"):
@@ -5,47 +5,71 @@ Runs 100% locally. Best for privacy-sensitive documents (banks, enterprises).
 Best Thai model: qwen2.5vl or qwen2.5vl:72b (requires 128GB+ RAM)
 """
 
+import asyncio
 import sys
-import time
-from .base import BaseVisionProvider
+from functools import cached_property
+
+try:
+    import ollama
+except ImportError:
+    ollama = None  # Reported by check()
+
+from .base import BaseVisionProvider, retry_delay
 
 
 class OllamaProvider(BaseVisionProvider):
     """Vision provider using local Ollama instance."""
 
-    def ask(self, image_b64: str, prompt: str, retries: int = 3) -> str:
-        import ollama
+    # Matches Ollama's default OLLAMA_NUM_PARALLEL; more requests only queue on the server
+    max_in_flight = 4
+
+    @cached_property
+    def _client(self):
+        """One AsyncClient per provider, so its connection pool is reused across pages."""
+        return ollama.AsyncClient()
+
+    async def ask(
+        self,
+        image:      bytes,
+        prompt:     str,
+        media_type: str = "image/png",
+        retries:    int = 3,
+    ) -> str:
+        # Ollama sniffs the image format itself; media_type is unused here.
+        # Raw bytes are base64-encoded once by the client when it serializes the
+        # request — a base64 str would instead be decoded again for validation.
+        messages = [{
+            "role": "user",
+            "content": prompt,
+            "images": [image],
+        }]
         for attempt in range(retries):
             try:
-                response = ollama.chat(
-                    model=self.model,
-                    messages=[{
-                        "role": "user",
-                        "content": prompt,
-                        "images": [image_b64],
-                    }],
-                )
+                async with self._in_flight:
+                    response = await self._client.chat(
+                        model=self.model,
+                        messages=messages,
+                    )
                 return response["message"]["content"].strip()
             except Exception as e:
-                if attempt < retries - 1:
-                    print(f"  Warning: Ollama error (attempt {attempt+1}/{retries}): {e}")
-                    time.sleep(2)
-                else:
+                delay = retry_delay(e, attempt)
+                if delay is None or attempt == retries - 1:
                     return f"[Ollama error: {e}]"
+                print(f"  Warning: Ollama error (attempt {attempt+1}/{retries}): {e}")
+                await asyncio.sleep(delay)
 
     def check(self) -> None:
-        try:
-            import ollama
-        except ImportError:
+        if ollama is None:
             print("Missing package: pip install ollama")
             sys.exit(1)
         try:
             models    = ollama.list()
-            available = [m["name"] for m in models.get("models", [])]
-            if not any(self.model in m for m in available):
+            # ollama-python >= 0.4 reports "model"; older releases used "name"
+            available = {m.get("model") or m.get("name") for m in models.get("models", [])}
+            if self.model not in available and f"{self.model}:latest" not in available:
                 print(f"\nModel '{self.model}' not found in Ollama.")
                 print(f"Run: ollama pull {self.model}")
-                print(f"Available: {', '.join(available) or 'none'}")
+                print(f"Available: {', '.join(sorted(available)) or 'none'}")
                 sys.exit(1)
             print(f"  Ollama model '{self.model}' is ready.")
         except Exception as e:
@@ -6,49 +6,82 @@ Requires: pip install openai
 Requires: OPENAI_API_KEY environment variable
 """
 
+import asyncio
 import os
 import sys
-import time
-from .base import BaseVisionProvider
+from functools import cached_property
+
+try:
+    import openai
+except ImportError:
+    openai = None  # Reported by check()
+
+from .base import BaseVisionProvider, encode_image, http_client_options, retry_delay
 
 
 class OpenAIProvider(BaseVisionProvider):
     """Vision provider using OpenAI GPT-4o."""
 
-    def ask(self, image_b64: str, prompt: str, retries: int = 3) -> str:
-        from openai import OpenAI
-        client = OpenAI(api_key=os.environ.get("OPENAI_API_KEY"))
+    supports_multi_image = True
+
+    @cached_property
+    def _client(self):
+        """One AsyncOpenAI client per provider, so its connection pool is reused across pages."""
+        return openai.AsyncOpenAI(
+            api_key=os.environ.get("OPENAI_API_KEY"),
+            max_retries=0,  # ask_images() retries with retry_delay(); SDK retries would stack on top
+            http_client=openai.DefaultAsyncHttpxClient(**http_client_options()),
+        )
+
+    async def ask(
+        self,
+        image:      bytes,
+        prompt:     str,
+        media_type: str = "image/png",
+        retries:    int = 3,
+    ) -> str:
+        return await self.ask_images([image], prompt, [media_type], retries)
+
+    async def ask_images(
+        self,
+        images:      list[bytes],
+        prompt:      str,
+        media_types: list[str] = None,
+        retries:     int = 3,
+    ) -> str:
+        media_types = media_types or ["image/png"] * len(images)
+        # Built once per request and reused unchanged across retries
+        messages = [{
+            "role": "user",
+            "content": [{"type": "text", "text": prompt}] + [
+                {
+                    "type": "image_url",
+                    "image_url": {
+                        "url": f"data:{media_type};base64,{image_b64}",
+                        "detail": "high",
+                    },
+                }
+                for image_b64, media_type in zip(map(encode_image, images), media_types)
+            ],
+        }]
         for attempt in range(retries):
             try:
-                response = client.chat.completions.create(
-                    model=self.model,
-                    messages=[{
-                        "role": "user",
-                        "content": [
-                            {"type": "text", "text": prompt},
-                            {
-                                "type": "image_url",
-                                "image_url": {
-                                    "url": f"data:image/png;base64,{image_b64}",
-                                    "detail": "high",
-                                },
-                            },
-                        ],
-                    }],
-                    max_tokens=2048,
-                )
+                async with self._in_flight:
+                    response = await self._client.chat.completions.create(
+                        model=self.model,
+                        messages=messages,
+                        max_tokens=2048 * len(images),
+                    )
                 return response.choices[0].message.content.strip()
             except Exception as e:
-                if attempt < retries - 1:
-                    print(f"  Warning: OpenAI error (attempt {attempt+1}/{retries}): {e}")
-                    time.sleep(3)
-                else:
+                delay = retry_delay(e, attempt)
+                if delay is None or attempt == retries - 1:
                     return f"[OpenAI error: {e}]"
+                print(f"  Warning: OpenAI error (attempt {attempt+1}/{retries}): {e}")
+                await asyncio.sleep(delay)
 
     def check(self) -> None:
-        try:
-            from openai import OpenAI
-        except ImportError:
+        if openai is None:
             print("Missing package: pip install openai")
             sys.exit(1)
         if not os.environ.get("OPENAI_API_KEY"):